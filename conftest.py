@@ -0,0 +1,4 @@
+"""Pytest root marker: puts the repository root on sys.path so tests can import its packages."""
+
+# Script that drives a running FFTE API server, not a unit test
+collect_ignore = ["test_api.py"]
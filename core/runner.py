@@ -6,12 +6,22 @@ This contains the reusable FFTE scanning workflow used by both the CLI and the A
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from urllib.parse import urljoin, urlparse
 
 from surface_discovery.openapi_parser import Endpoint, fetch_and_parse
 from input_generation.edge_cases import generate_edge_cases_flat, generate_sample_object
 from execution.http_executor import execute_request
-from reporting.report import ExecutionLogEntry, generate_report
+from reporting.report import ExecutionLogEntry, generate_report_with_failures
+
+
+@dataclass
+class RunResult:
+    """Outcome of a scan: curl report, the same failures in structured form, and the endpoints scanned."""
+
+    report: dict[str, list[str]]
+    failures: list[dict[str, str]] = field(default_factory=list)
+    endpoints: list[Endpoint] = field(default_factory=list)
 
 
 def _path_param_value(param_type: str | None) -> str:
@@ -50,13 +60,37 @@ def run(
     *,
     timeout: float = 10.0,
     limit_endpoints: int | None = None,
+    endpoints: list[Endpoint] | None = None,
 ) -> dict[str, list[str]]:
     """Run the full failure-first fuzzing workflow."""
+    return run_detailed(
+        spec_url,
+        base_url,
+        timeout=timeout,
+        limit_endpoints=limit_endpoints,
+        endpoints=endpoints,
+    ).report
+
+
+def run_detailed(
+    spec_url: str,
+    base_url: str | None = None,
+    *,
+    timeout: float = 10.0,
+    limit_endpoints: int | None = None,
+    endpoints: list[Endpoint] | None = None,
+) -> RunResult:
+    """
+    Run the workflow and return both the curl report and structured failures.
+
+    Pass endpoints already parsed from spec_url to skip fetching it again.
+    """
     if base_url is None:
         parsed = urlparse(spec_url)
         base_url = f"{parsed.scheme}://{parsed.netloc}"
 
-    endpoints = fetch_and_parse(spec_url)
+    if endpoints is None:
+        endpoints = fetch_and_parse(spec_url)
     if limit_endpoints is not None:
         endpoints = endpoints[:limit_endpoints]
 
@@ -117,4 +151,5 @@ def run(
                 )
             )
 
-    return generate_report(entries)
+    report, failures = generate_report_with_failures(entries)
+    return RunResult(report=report, failures=failures, endpoints=endpoints)
@@ -5,10 +5,13 @@ FFTE API Service - FIXED to use actual target URLs instead of hardcoded victim A
 
 import uuid
 import json
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
 from typing import Dict, List, Optional, Any
 from datetime import datetime
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from pydantic import BaseModel, Field
 import threading
 
@@ -42,62 +45,103 @@ class ScanResult(BaseModel):
     formatted_report: str
     statistics: Dict[str, int]
 
+_STATUS_FIELDS = frozenset(ScanStatus.model_fields)
+
 # ================ Scan Manager ================
 class ScanManager:
-    """Manages all scans in the system."""
+    """Manages all scans in the system.
+    
+    Single dict reads and writes are atomic under the GIL, so there is no
+    manager-wide lock; each scan carries its own "_lock" for updates.
+    Serialized ScanStatus dicts are cached per scan in "_status_cache" and
+    dropped whenever an update touches a status field.
+    """
     
     def __init__(self):
         self.scans: Dict[str, Dict] = {}
-        self.lock = threading.Lock()
     
     def create_scan(self, request: ScanRequest) -> str:
         """Create a new scan and return its ID."""
         scan_id = str(uuid.uuid4())
         
+        # Only the request fields the scan actually reads are kept
         scan_data = {
             "scan_id": scan_id,
-            "request": request.model_dump(),
+            "target_url": request.spec_url or request.target_url,
+            "scan_name": request.scan_name or "UNNAMED_ALPHA",
+            "base_url": request.base_url,
+            "max_cases": request.max_cases_per_field,
             "status": "pending",
             "progress": 0.0,
             "start_time": datetime.now(),
             "end_time": None,
             "tests_executed": 0,
             "failures_found": 0,
+            "endpoints": [],  # filled in by run_scan once the spec is parsed
             "results": None,
             "error": None,
         }
         
-        with self.lock:
-            self.scans[scan_id] = scan_data
-        
+        self.add_scan(scan_data)
         return scan_id
     
+    def add_scan(self, scan_data: Dict):
+        """Register a fully built scan dict under its scan_id."""
+        scan_data["_lock"] = threading.Lock()
+        self.scans[scan_data["scan_id"]] = scan_data
+    
     def update_scan(self, scan_id: str, **kwargs):
         """Update scan data."""
-        with self.lock:
-            if scan_id in self.scans:
-                self.scans[scan_id].update(kwargs)
+        scan = self.scans.get(scan_id)
+        if scan:
+            with scan["_lock"]:
+                scan.update(kwargs)
+                if not _STATUS_FIELDS.isdisjoint(kwargs):
+                    scan["_status_cache"] = None
     
     def get_scan(self, scan_id: str) -> Optional[Dict]:
         """Get scan data by ID."""
-        with self.lock:
-            return self.scans.get(scan_id)
+        return self.scans.get(scan_id)
+    
+    def get_status(self, scan_id: str) -> Optional[Dict]:
+        """Get the JSON-ready ScanStatus dict for a scan, building it only if stale."""
+        scan = self.scans.get(scan_id)
+        if not scan:
+            return None
+        return self._status(scan)
+    
+    def list_statuses(self) -> List[Dict]:
+        """List JSON-ready ScanStatus dicts for all scans."""
+        return [self._status(scan) for scan in self.list_scans()]
+    
+    def _status(self, scan: Dict) -> Dict:
+        with scan["_lock"]:
+            if scan.get("_status_cache") is None:
+                scan["_status_cache"] = ScanStatus(
+                    scan_id=scan["scan_id"],
+                    status=scan["status"],
+                    progress=scan["progress"],
+                    start_time=scan["start_time"],
+                    end_time=scan.get("end_time"),
+                    target_url=scan["target_url"],
+                    scan_name=scan["scan_name"],
+                    tests_executed=scan.get("tests_executed", 0),
+                    failures_found=scan.get("failures_found", 0),
+                    endpoints=scan.get("endpoints", [])
+                ).model_dump(mode="json")
+            return scan["_status_cache"]
     
     def list_scans(self) -> List[Dict]:
         """List all scans."""
-        with self.lock:
-            return list(self.scans.values())
+        return list(self.scans.values())
     
     def delete_scan(self, scan_id: str) -> bool:
         """Delete a scan."""
-        with self.lock:
-            if scan_id in self.scans:
-                del self.scans[scan_id]
-                return True
-        return False
+        return self.scans.pop(scan_id, None) is not None
 
 # ================ Real Scanner (uses core.runner) ================
-from core.runner import run as core_run
+from core.runner import run_detailed as core_run
+from surface_discovery.openapi_parser import fetch_and_parse
 
 class FFTEScanner:
     """Runs FFTE scans using the actual core runner."""
@@ -112,16 +156,23 @@ class FFTEScanner:
             if not scan:
                 return
             
-            request_data = scan["request"]
-            spec_url = request_data.get("target_url") or request_data.get("spec_url")
-            base_url = request_data.get("base_url")
-            max_cases = request_data.get("max_cases_per_field", 3)
+            spec_url = scan["target_url"]
+            base_url = scan["base_url"]
+            max_cases = scan["max_cases"]
             
             if not spec_url:
                 raise ValueError("No spec_url or target_url provided")
             
-            # Update status to running
-            self.scan_manager.update_scan(scan_id, status="running", progress=10.0)
+            # Parse the spec once here and hand the list to core_run
+            endpoints = fetch_and_parse(spec_url)
+            
+            # Update status to running, with endpoint previews for the UI
+            self.scan_manager.update_scan(
+                scan_id,
+                status="running",
+                progress=10.0,
+                endpoints=[{"method": e.method_upper, "path": e.path} for e in endpoints[:10]]
+            )
             
             # Run the actual FFTE core scanner
             print(f"🔍 Starting scan on: {spec_url}")
@@ -129,12 +180,15 @@ class FFTEScanner:
             print(f"   Max cases per field: {max_cases}")
             
             # Use the actual core runner from core/runner.py
-            report = core_run(
+            run_result = core_run(
                 spec_url=spec_url,
                 base_url=base_url,
                 timeout=10.0,
-                limit_endpoints=None
+                limit_endpoints=None,
+                endpoints=endpoints
             )
+            report = run_result.report
+            failures_list = run_result.failures
             
             # Count statistics
             from reporting.report import format_report
@@ -142,41 +196,6 @@ class FFTEScanner:
             total_failures = sum(len(cmds) for cmds in report.values())
             formatted = format_report(report)
             
-            # Convert report to failures list for UI
-            failures_list = []
-            for failure_type, curl_commands in report.items():
-                for cmd in curl_commands:
-                    # Parse curl command to extract method, url, payload
-                    method = "POST" if "-X POST" in cmd else "GET"
-                    url = ""
-                    payload = "{}"
-                    
-                    # Extract URL (between quotes after curl)
-                    import re
-                    url_match = re.search(r'"(https?://[^"]+)"', cmd)
-                    if url_match:
-                        url = url_match.group(1)
-                    
-                    # Extract payload (after -d)
-                    payload_match = re.search(r"-d '([^']+)'", cmd)
-                    if payload_match:
-                        payload = payload_match.group(1)
-                    
-                    failures_list.append({
-                        "method": method,
-                        "url": url,
-                        "type": failure_type,
-                        "payload": payload
-                    })
-            
-            # Get endpoint count from spec
-            from surface_discovery.openapi_parser import fetch_and_parse
-            try:
-                endpoints = fetch_and_parse(spec_url)
-                endpoint_count = len(endpoints)
-            except:
-                endpoint_count = 0
-            
             # Update with results
             self.scan_manager.update_scan(
                 scan_id,
@@ -192,7 +211,7 @@ class FFTEScanner:
                     "statistics": {
                         "total_tests": len(failures_list),
                         "failures": total_failures,
-                        "endpoints": endpoint_count
+                        "endpoints": len(endpoints)
                     }
                 }
             )
@@ -210,11 +229,20 @@ class FFTEScanner:
                 end_time=datetime.now()
             )
 
+# Scans are network-bound, so run several at once off the event loop
+_scan_pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix="ffte-scan")
+
 # ================ FastAPI App ================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    _scan_pool.shutdown(wait=False, cancel_futures=True)
+
 app = FastAPI(
     title="FFTE API",
     description="Failure-First Testing Engine - REST API (FIXED VERSION)",
-    version="2.0.0"
+    version="2.0.0",
+    lifespan=lifespan
 )
 
 # Initialize components
@@ -232,45 +260,16 @@ app.add_middleware(
 
 # ================ API Endpoints ================
 @app.post("/api/scan/start")
-async def start_scan(request: ScanRequest, background_tasks: BackgroundTasks):
+async def start_scan(request: ScanRequest):
     # Ensure one of the URLs is present
     url = request.spec_url or request.target_url
     if not url:
         raise HTTPException(status_code=422, detail="spec_url or target_url required")
     
-    # Store with unified naming
-    req_dict = request.model_dump()
-    req_dict["target_url"] = url 
-    
-    scan_id = str(uuid.uuid4())
-    
-    # Get endpoint info for UI preview (non-blocking)
-    try:
-        from surface_discovery.openapi_parser import fetch_and_parse
-        endpoints = fetch_and_parse(url)
-        endpoint_previews = [{"method": e.method.upper(), "path": e.path} for e in endpoints[:10]]
-    except:
-        endpoint_previews = []
-    
-    scan_data = {
-        "scan_id": scan_id,
-        "request": req_dict,
-        "status": "pending",
-        "progress": 0.0,
-        "start_time": datetime.now(),
-        "end_time": None,
-        "tests_executed": 0,
-        "failures_found": 0,
-        "endpoints": endpoint_previews,
-        "results": None,
-        "error": None,
-    }
-    
-    with scan_manager.lock:
-        scan_manager.scans[scan_id] = scan_data
+    scan_id = scan_manager.create_scan(request)
     
     # Run scan in background
-    background_tasks.add_task(scanner.run_scan, scan_id)
+    _scan_pool.submit(scanner.run_scan, scan_id)
     
     return {"scan_id": scan_id, "status": "started"}
 
@@ -279,43 +278,19 @@ async def get_scan_status(scan_id: str):
     """
     Get status and progress of a scan.
     """
-    scan = scan_manager.get_scan(scan_id)
-    if not scan:
+    status = scan_manager.get_status(scan_id)
+    if status is None:
         raise HTTPException(status_code=404, detail=f"Scan {scan_id} not found")
     
-    return ScanStatus(
-        scan_id=scan_id,
-        status=scan["status"],
-        progress=scan["progress"],
-        start_time=scan["start_time"],
-        end_time=scan.get("end_time"),
-        target_url=scan["request"]["target_url"],
-        scan_name=scan["request"].get("scan_name") or "UNNAMED_ALPHA",
-        tests_executed=scan.get("tests_executed", 0),
-        failures_found=scan.get("failures_found", 0),
-        endpoints=scan.get("endpoints", [])
-    )
+    # Already validated by ScanStatus when cached; skip re-validation
+    return JSONResponse(status)
 
 @app.get("/api/scans", response_model=List[ScanStatus])
 async def list_scans():
     """
     List all scans (completed, running, and pending).
     """
-    scans = scan_manager.list_scans()
-    return [
-        ScanStatus(
-            scan_id=scan["scan_id"],
-            status=scan["status"],
-            progress=scan["progress"],
-            start_time=scan["start_time"],
-            end_time=scan.get("end_time"),
-            target_url=scan["request"]["target_url"],
-            scan_name=scan["request"].get("scan_name"),
-            tests_executed=scan.get("tests_executed", 0),
-            failures_found=scan.get("failures_found", 0)
-        )
-        for scan in scans
-    ]
+    return JSONResponse(scan_manager.list_statuses())
 
 @app.delete("/api/scan/{scan_id}", response_model=Dict[str, str])
 async def delete_scan(scan_id: str):
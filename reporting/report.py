@@ -84,6 +84,30 @@ def group_failures_by_type(
     return dict(grouped)
 
 
+def _url_with_params(entry: ExecutionLogEntry) -> str:
+    """Return the entry URL with its query params appended."""
+    url = entry.url
+    params = entry.params or {}
+    if params:
+        from urllib.parse import urlencode
+
+        qs = urlencode(params, doseq=True)
+        sep = "&" if "?" in url else "?"
+        url = f"{url}{sep}{qs}"
+    return url
+
+
+def _body_string(entry: ExecutionLogEntry) -> str | None:
+    """Return the request body as sent, or None if the entry had no body."""
+    if entry.json_body is not None:
+        return json.dumps(entry.json_body, ensure_ascii=False)
+    if entry.data is not None:
+        if isinstance(entry.data, (dict, list)):
+            return json.dumps(entry.data, ensure_ascii=False)
+        return str(entry.data)
+    return None
+
+
 def to_curl(entry: ExecutionLogEntry) -> str:
     """
     Generate a reproducible curl command from an execution log entry.
@@ -94,6 +118,11 @@ def to_curl(entry: ExecutionLogEntry) -> str:
     Returns:
         A curl command string that can be run in a shell.
     """
+    return _curl(entry, _url_with_params(entry), _body_string(entry))
+
+
+def _curl(entry: ExecutionLogEntry, url: str, body_str: str | None) -> str:
+    """Build the curl command from an already formatted url and body."""
     parts: list[str] = ["curl"]
     parts.append("-X")
     parts.append(entry.method.upper())
@@ -105,35 +134,47 @@ def to_curl(entry: ExecutionLogEntry) -> str:
         parts.append(f'-H "{key}: {escaped}"')
 
     # URL with query params
-    url = entry.url
-    params = entry.params or {}
-    if params:
-        from urllib.parse import urlencode
-
-        qs = urlencode(params, doseq=True)
-        sep = "&" if "?" in url else "?"
-        url = f"{url}{sep}{qs}"
     parts.append(f'"{url}"')
 
     # Body
-    if entry.json_body is not None:
-        body_str = json.dumps(entry.json_body, ensure_ascii=False)
+    if body_str is not None:
         # For curl -d, we use single quotes and escape single quotes
         escaped = body_str.replace("'", "'\\''")
         parts.append(f"-d '{escaped}'")
-        if "content-type" not in {k.lower() for k in (entry.headers or {}).keys()}:
+        has_content_type = "content-type" in {k.lower() for k in (entry.headers or {}).keys()}
+        if entry.json_body is not None and not has_content_type:
             parts.append("-H \"Content-Type: application/json\"")
-    elif entry.data is not None:
-        if isinstance(entry.data, (dict, list)):
-            body_str = json.dumps(entry.data, ensure_ascii=False)
-        else:
-            body_str = str(entry.data)
-        escaped = body_str.replace("'", "'\\''")
-        parts.append(f"-d '{escaped}'")
 
     return " ".join(parts)
 
 
+def to_failure(entry: ExecutionLogEntry, failure_type: FailureType) -> dict[str, str]:
+    """
+    Summarize a failed execution log entry for display.
+
+    Args:
+        entry: The failed ExecutionLogEntry.
+        failure_type: How the request failed.
+
+    Returns:
+        Dict with method, url (including query string), type and payload.
+        Payload is the request body as sent, or "{}" if there was none.
+    """
+    return _failure(entry, failure_type, _url_with_params(entry), _body_string(entry))
+
+
+def _failure(
+    entry: ExecutionLogEntry, failure_type: FailureType, url: str, body_str: str | None
+) -> dict[str, str]:
+    """Build the failure dict from an already formatted url and body."""
+    return {
+        "method": entry.method.upper(),
+        "url": url,
+        "type": failure_type.value,
+        "payload": body_str if body_str is not None else "{}",
+    }
+
+
 def load_entries_from_logs(logs: list[dict[str, Any]]) -> list[ExecutionLogEntry]:
     """
     Load ExecutionLogEntry list from log dicts (e.g. from JSON file).
@@ -157,11 +198,35 @@ def generate_report(
         Dict mapping failure type name (e.g. "server_error") to list of curl
         command strings. One curl per failed request, grouped by failure type.
     """
+    report, _ = generate_report_with_failures(entries)
+    return report
+
+
+def generate_report_with_failures(
+    entries: list[ExecutionLogEntry],
+) -> tuple[dict[str, list[str]], list[dict[str, str]]]:
+    """
+    Like generate_report, but also return the failures in structured form.
+
+    Args:
+        entries: List of ExecutionLogEntry with request and result.
+
+    Returns:
+        Tuple of (report, failures): report as returned by generate_report,
+        and one to_failure dict per failed request, in the same order.
+    """
     grouped = group_failures_by_type(entries)
     report: dict[str, list[str]] = {}
+    failures: list[dict[str, str]] = []
     for failure_type, failed_entries in grouped.items():
-        report[failure_type.value] = [to_curl(e) for e in failed_entries]
-    return report
+        curls = report[failure_type.value] = []
+        for e in failed_entries:
+            # Format url and body once; both the curl and the summary use them
+            url = _url_with_params(e)
+            body_str = _body_string(e)
+            curls.append(_curl(e, url, body_str))
+            failures.append(_failure(e, failure_type, url, body_str))
+    return report, failures
 
 
 def format_report(report: dict[str, list[str]]) -> str:
@@ -1,12 +1,41 @@
 """OpenAPI spec parser with $ref resolution and robust error handling."""
 from __future__ import annotations
-import json
-from dataclasses import dataclass
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
+try:
+    import yaml
+    # libyaml-backed loader when PyYAML was built with it
+    _YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+except ImportError:  # YAML specs are optional
+    yaml = None
 
-@dataclass
+# Shared session so repeated spec fetches reuse pooled keep-alive connections
+_SESSION = requests.Session()
+_SESSION.headers.update({"Accept": "application/json", "Accept-Encoding": "gzip, deflate"})
+_adapter = HTTPAdapter(pool_connections=16, pool_maxsize=16, max_retries=Retry(total=2, backoff_factor=0.2))
+_SESSION.mount("http://", _adapter)
+_SESSION.mount("https://", _adapter)
+
+# Parsed specs keyed by URL: (fetched_at, etag, endpoints), least recently used
+# first. Entries younger than _SPEC_CACHE_TTL are served without touching the
+# network; older ones are revalidated with If-None-Match when the server sent
+# an ETag. Scans run on several threads, so access goes through _SPEC_CACHE_LOCK.
+_SPEC_CACHE: Dict[str, Tuple[float, Optional[str], List["Endpoint"]]] = {}
+_SPEC_CACHE_LOCK = threading.Lock()
+_SPEC_CACHE_MAXSIZE = 32
+_SPEC_CACHE_TTL = 30.0
+
+_HTTP_METHODS = frozenset({'get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace'})
+
+
+@dataclass(slots=True)
 class Parameter:
     name: str
     location: str
@@ -15,7 +44,7 @@ class Parameter:
     schema: Optional[Dict[str, Any]] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class Endpoint:
     path: str
     method: str
@@ -23,38 +52,121 @@ class Endpoint:
     parameters: List[Parameter] = None
     request_body_schema: Optional[Dict[str, Any]] = None
     operation_id: Optional[str] = None
+    method_upper: str = field(init=False, repr=False, compare=False)
 
     def __post_init__(self):
         if self.parameters is None:
             self.parameters = []
+        self.method = self.method.lower()
+        self.method_upper = self.method.upper()
+
+
+def _mark_refs(node: Any, memo: Dict[int, bool]) -> bool:
+    """Return True if any dict within node has a $ref key.
+
+    One post-order pass records the answer for every dict and list under
+    node in memo, keyed by id(); subtrees already in memo are not walked
+    again, so repeated checks on the same tree stay linear overall.
+    """
+    if not isinstance(node, (dict, list)):
+        return False
+    # (container, None) on the way down; (container, its children) once they are queued
+    stack: List[Tuple[Any, Optional[List[Any]]]] = [(node, None)]
+    while stack:
+        current, children = stack.pop()
+        if children is not None:
+            memo[id(current)] = (isinstance(current, dict) and "$ref" in current) or any(
+                memo[id(c)] for c in children
+            )
+            continue
+        if id(current) in memo:
+            continue
+        children = [c for c in (current.values() if isinstance(current, dict) else current)
+                    if isinstance(c, (dict, list))]
+        stack.append((current, children))
+        stack.extend((c, None) for c in children)
+    return memo[id(node)]
+
+
+def resolve_refs(schema: Any, spec: Dict[str, Any], cache: Optional[Dict[str, Any]] = None) -> Any:
+    """Resolve all $ref in schema.
 
+    Walks the schema with an explicit stack instead of recursing. Subtrees
+    without any $ref are returned as-is rather than copied. A $ref to a ref
+    already being resolved above it is replaced by {}: a cycle is followed
+    once around and cut where it would re-enter.
 
-def resolve_refs(schema: Any, spec: Dict[str, Any]) -> Any:
-    """Resolve all $ref in schema recursively."""
+    Refs whose resolution is cycle-free are memoized in cache (share one
+    dict across calls on the same spec). Refs whose subtree was cut by a
+    cycle are never cached, so the result does not depend on the order in
+    which schemas sharing a cache are resolved.
+    """
     if not isinstance(schema, dict):
         return schema
+    # Which subtrees hold a $ref, keyed by id(); valid for this call only
+    ref_marks: Dict[int, bool] = {}
+    if not _mark_refs(schema, ref_marks):
+        return schema
+    if cache is None:
+        cache = {}
     
-    if "$ref" in schema:
-        ref = schema["$ref"]
-        if ref.startswith("#/"):
-            parts = ref[2:].split("/")
+    root = [schema]
+    # (container, key, refs being resolved above this slot); the walk fills
+    # container[key] with the resolved value. Stack order is depth-first, so
+    # a ref resolved earlier that is not an ancestor has been fully resolved.
+    stack: List[Tuple[Any, Any, Tuple[str, ...]]] = [(root, 0, ())]
+    # Refs resolved in this call. Only those never cut short by a cycle are
+    # copied into cache: a cut ref's result depends on where it was reached.
+    resolved: Dict[str, Any] = {}
+    cyclic: set = set()
+    while stack:
+        container, key, active = stack.pop()
+        node = container[key]
+        
+        chain: List[str] = []
+        done = False
+        while isinstance(node, dict) and "$ref" in node and node["$ref"].startswith("#/"):
+            ref = node["$ref"]
+            if ref in active or ref in chain:
+                cyclic.update(active)
+                cyclic.update(chain)
+                node, done = {}, True
+                break
+            if ref in cache:
+                node, done = cache[ref], True
+                break
+            if ref in resolved and ref not in cyclic:
+                node, done = resolved[ref], True
+                break
+            chain.append(ref)
             obj = spec
-            for part in parts:
+            for part in ref[2:].split("/"):
                 obj = obj.get(part, {})
-            return resolve_refs(obj, spec)
-    
-    result = {}
-    for k, v in schema.items():
-        if isinstance(v, dict):
-            result[k] = resolve_refs(v, spec)
-        elif isinstance(v, list):
-            result[k] = [resolve_refs(item, spec) if isinstance(item, dict) else item for item in v]
-        else:
-            result[k] = v
-    return result
+            node = obj
+        
+        if not done and isinstance(node, dict) and _mark_refs(node, ref_marks):
+            node = dict(node)
+            child_active = active + tuple(chain)
+            for k, v in node.items():
+                if isinstance(v, dict):
+                    stack.append((node, k, child_active))
+                elif isinstance(v, list):
+                    items = node[k] = list(v)
+                    for i, item in enumerate(items):
+                        if isinstance(item, dict):
+                            stack.append((items, i, child_active))
+        
+        for ref in chain:
+            resolved[ref] = node
+        container[key] = node
+    
+    for ref, node in resolved.items():
+        if ref not in cyclic:
+            cache[ref] = node
+    return root[0]
 
 
-def _parse_parameters(params_data: Any, spec: Dict[str, Any]) -> List[Parameter]:
+def _parse_parameters(params_data: Any, spec: Dict[str, Any], ref_cache: Dict[str, Any]) -> List[Parameter]:
     """Parse parameters from various formats."""
     if not params_data:
         return []
@@ -65,12 +177,14 @@ def _parse_parameters(params_data: Any, spec: Dict[str, Any]) -> List[Parameter]
         for p in params_data:
             if not isinstance(p, dict):
                 continue
+            schema = p.get("schema")
+            is_dict = isinstance(schema, dict)
             params.append(Parameter(
                 name=p.get("name", ""),
                 location=p.get("in", ""),
-                param_type=p.get("schema", {}).get("type") if isinstance(p.get("schema"), dict) else None,
+                param_type=schema.get("type") if is_dict else None,
                 required=p.get("required", False),
-                schema=resolve_refs(p.get("schema", {}), spec) if isinstance(p.get("schema"), dict) else {}
+                schema=resolve_refs(schema, spec, ref_cache) if is_dict else {}
             ))
         return params
     
@@ -81,7 +195,7 @@ def _parse_parameters(params_data: Any, spec: Dict[str, Any]) -> List[Parameter]
     return []
 
 
-def _parse_request_body(req_body: Any, spec: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+def _parse_request_body(req_body: Any, spec: Dict[str, Any], ref_cache: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     """Parse request body schema from various formats."""
     if not req_body or not isinstance(req_body, dict):
         return None
@@ -97,32 +211,19 @@ def _parse_request_body(req_body: Any, spec: Dict[str, Any]) -> Optional[Dict[st
         if "json" in ct.lower():
             schema = ct_spec.get("schema", {})
             if isinstance(schema, dict):
-                return resolve_refs(schema, spec)
+                return resolve_refs(schema, spec, ref_cache)
     
     return None
 
 
-def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
-    """Fetch and parse OpenAPI spec from URL with robust error handling."""
-    try:
-        response = requests.get(openapi_url, timeout=10)
-        response.raise_for_status()
-    except requests.RequestException as e:
-        raise ValueError(f"Failed to fetch OpenAPI spec from {openapi_url}: {e}")
-    
-    try:
-        spec = response.json()
-    except json.JSONDecodeError as e:
-        raise ValueError(f"Invalid JSON in OpenAPI spec: {e}")
-    
-    if not isinstance(spec, dict):
-        raise ValueError("OpenAPI spec must be a JSON object")
-    
+def _spec_to_endpoints(spec: Dict[str, Any]) -> List[Endpoint]:
+    """Build the endpoint list from a decoded OpenAPI spec."""
     paths = spec.get("paths", {})
     if not isinstance(paths, dict):
         raise ValueError("'paths' in OpenAPI spec must be an object")
     
     endpoints = []
+    ref_cache: Dict[str, Any] = {}
     
     for path, path_item in paths.items():
         if not isinstance(path_item, dict):
@@ -132,7 +233,8 @@ def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
         # Iterate through HTTP methods
         for method, operation in path_item.items():
             # Skip non-method keys like 'summary', 'description', 'parameters', '$ref'
-            if method.lower() not in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']:
+            m_lower = method.lower()
+            if m_lower not in _HTTP_METHODS:
                 continue
             
             # Ensure operation is a dict
@@ -141,14 +243,14 @@ def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
                 continue
             
             # Parse parameters
-            params = _parse_parameters(operation.get("parameters", []), spec)
+            params = _parse_parameters(operation.get("parameters", []), spec, ref_cache)
             
             # Parse request body
-            body_schema = _parse_request_body(operation.get("requestBody"), spec)
+            body_schema = _parse_request_body(operation.get("requestBody"), spec, ref_cache)
             
             endpoints.append(Endpoint(
                 path=path,
-                method=method.lower(),
+                method=m_lower,
                 summary=operation.get("summary"),
                 parameters=params,
                 request_body_schema=body_schema,
@@ -161,18 +263,93 @@ def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
     return endpoints
 
 
+def _spec_cache_get(openapi_url: str) -> Optional[Tuple[float, Optional[str], List[Endpoint]]]:
+    """Look up a cached spec and mark it most recently used."""
+    with _SPEC_CACHE_LOCK:
+        entry = _SPEC_CACHE.pop(openapi_url, None)
+        if entry is not None:
+            _SPEC_CACHE[openapi_url] = entry
+        return entry
+
+
+def _spec_cache_put(openapi_url: str, etag: Optional[str], endpoints: List[Endpoint]):
+    """Store a freshly fetched or revalidated spec, evicting the least recently used one."""
+    with _SPEC_CACHE_LOCK:
+        _SPEC_CACHE.pop(openapi_url, None)
+        if len(_SPEC_CACHE) >= _SPEC_CACHE_MAXSIZE:
+            # Dicts keep insertion order and every use re-inserts, so the first key is the LRU entry
+            del _SPEC_CACHE[next(iter(_SPEC_CACHE))]
+        _SPEC_CACHE[openapi_url] = (time.monotonic(), etag, endpoints)
+
+
+def fetch_and_parse(openapi_url: str) -> List[Endpoint]:
+    """Fetch and parse OpenAPI spec from URL with robust error handling.
+
+    Results are cached per URL (see _SPEC_CACHE), so repeated calls for the
+    same spec skip the download and parse.
+    """
+    cached = _spec_cache_get(openapi_url)
+    if cached is not None and time.monotonic() - cached[0] < _SPEC_CACHE_TTL:
+        return list(cached[2])
+    
+    headers = {}
+    if cached is not None and cached[1]:
+        headers["If-None-Match"] = cached[1]
+    
+    try:
+        response = _SESSION.get(openapi_url, timeout=10, headers=headers)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        raise ValueError(f"Failed to fetch OpenAPI spec from {openapi_url}: {e}")
+    
+    if cached is not None and response.status_code == 304:
+        _spec_cache_put(openapi_url, cached[1], cached[2])
+        return list(cached[2])
+    
+    # response.content is the raw (already gzip-decoded) body; orjson parses
+    # the bytes directly, skipping the str copy that response.json() makes.
+    etag = response.headers.get("ETag")
+    try:
+        spec = orjson.loads(response.content)
+    except orjson.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSON in OpenAPI spec: {e}")
+    # Free the raw body before the endpoint walk; only the decoded spec is needed
+    del response
+    
+    if not isinstance(spec, dict):
+        raise ValueError("OpenAPI spec must be a JSON object")
+    
+    endpoints = _spec_to_endpoints(spec)
+    
+    _spec_cache_put(openapi_url, etag, endpoints)
+    
+    return list(endpoints)
+
+
+def _load_yaml(data: bytes) -> Any:
+    """Decode a YAML document with the fastest available safe loader."""
+    if yaml is None:
+        raise ValueError("PyYAML is required to read YAML specs")
+    return yaml.load(data, Loader=_YamlLoader)
+
+
 def parse_from_file(file_path: str) -> List[Endpoint]:
-    """Parse OpenAPI spec from a local file."""
+    """Parse OpenAPI spec from a local file.
+
+    .yaml/.yml files are read as YAML; anything else is tried as JSON first,
+    then YAML.
+    """
+    is_yaml = file_path.lower().endswith((".yaml", ".yml"))
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            # Try JSON first
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        if is_yaml:
+            spec = _load_yaml(data)
+        else:
             try:
-                spec = json.load(f)
-            except json.JSONDecodeError:
-                # Try YAML
-                f.seek(0)
-                import yaml
-                spec = yaml.safe_load(f)
+                spec = orjson.loads(data)
+            except orjson.JSONDecodeError:
+                spec = _load_yaml(data)
     except FileNotFoundError:
         raise ValueError(f"File not found: {file_path}")
     except Exception as e:
@@ -181,36 +358,4 @@ def parse_from_file(file_path: str) -> List[Endpoint]:
     if not isinstance(spec, dict):
         raise ValueError("OpenAPI spec must be a JSON/YAML object")
     
-    paths = spec.get("paths", {})
-    if not isinstance(paths, dict):
-        raise ValueError("'paths' in OpenAPI spec must be an object")
-    
-    endpoints = []
-    
-    for path, path_item in paths.items():
-        if not isinstance(path_item, dict):
-            continue
-        
-        for method, operation in path_item.items():
-            if method.lower() not in ['get', 'post', 'put', 'patch', 'delete', 'head', 'options', 'trace']:
-                continue
-            
-            if not isinstance(operation, dict):
-                continue
-            
-            params = _parse_parameters(operation.get("parameters", []), spec)
-            body_schema = _parse_request_body(operation.get("requestBody"), spec)
-            
-            endpoints.append(Endpoint(
-                path=path,
-                method=method.lower(),
-                summary=operation.get("summary"),
-                parameters=params,
-                request_body_schema=body_schema,
-                operation_id=operation.get("operationId")
-            ))
-    
-    if not endpoints:
-        raise ValueError("No valid endpoints found in OpenAPI spec")
-    
-    return endpoints
\ No newline at end of file
+    return _spec_to_endpoints(spec)
@@ -0,0 +1,161 @@
+"""Tests for $ref resolution in surface_discovery.openapi_parser."""
+
+from __future__ import annotations
+
+import copy
+import itertools
+
+from surface_discovery.openapi_parser import _spec_to_endpoints, resolve_refs
+
+
+def _baseline_resolve_refs(schema, spec):
+    """The original recursive resolve_refs, kept as the reference behaviour."""
+    if not isinstance(schema, dict):
+        return schema
+
+    if "$ref" in schema:
+        ref = schema["$ref"]
+        if ref.startswith("#/"):
+            parts = ref[2:].split("/")
+            obj = spec
+            for part in parts:
+                obj = obj.get(part, {})
+            return _baseline_resolve_refs(obj, spec)
+
+    result = {}
+    for k, v in schema.items():
+        if isinstance(v, dict):
+            result[k] = _baseline_resolve_refs(v, spec)
+        elif isinstance(v, list):
+            result[k] = [_baseline_resolve_refs(item, spec) if isinstance(item, dict) else item for item in v]
+        else:
+            result[k] = v
+    return result
+
+
+def _ref(name: str) -> dict:
+    return {"$ref": f"#/components/schemas/{name}"}
+
+
+def _deep_schema(depth: int, dict_type: type = dict) -> dict:
+    """Schema nested depth levels via "next", with ref-free siblings at every level and a $ref at the bottom."""
+    node = dict_type({"$ref": "#/components/schemas/Tag"})
+    for _ in range(depth):
+        props = dict_type({"next": node})
+        for i in range(5):
+            props[f"s{i}"] = dict_type({"type": "object", "properties": dict_type({"v": dict_type({"type": "string"})})})
+        node = dict_type({"type": "object", "properties": props})
+    return node
+
+
+def _spec(schemas: dict) -> dict:
+    return {"openapi": "3.0.0", "paths": {}, "components": {"schemas": schemas}}
+
+
+ACYCLIC = _spec({
+    "Tag": {"type": "object", "properties": {"label": {"type": "string"}}},
+    "Alias": _ref("Tag"),
+    "Item": {
+        "type": "object",
+        "required": ["id"],
+        "properties": {
+            "id": {"type": "integer"},
+            "tag": _ref("Alias"),
+            "tags": {"type": "array", "items": _ref("Tag")},
+            "either": {"oneOf": [_ref("Tag"), {"type": "string"}, 3]},
+            "external": {"$ref": "other.json#/Thing"},
+            "missing": _ref("Nope"),
+        },
+    },
+    "Order": {"type": "object", "properties": {"items": {"type": "array", "items": _ref("Item")}}},
+})
+
+CYCLIC = _spec({
+    "A": {"type": "object", "properties": {"b": _ref("B"), "tag": _ref("Tag")}},
+    "B": {"type": "object", "properties": {"a": _ref("A")}},
+    "Self": {"type": "object", "properties": {"me": _ref("Self")}},
+    "Loop": _ref("Loop"),
+    "Node": {"type": "object", "properties": {"children": {"type": "array", "items": [_ref("Node")]}}},
+    "Tag": {"type": "object", "properties": {"label": {"type": "string"}}},
+})
+
+
+def test_acyclic_matches_baseline():
+    for name in ACYCLIC["components"]["schemas"]:
+        schema = {"wrapped": _ref(name), "list": [1, _ref(name)]}
+        assert resolve_refs(schema, ACYCLIC) == _baseline_resolve_refs(schema, ACYCLIC)
+
+
+def test_acyclic_shared_cache_matches_baseline_in_any_order():
+    names = list(ACYCLIC["components"]["schemas"])
+    for order in itertools.permutations(names):
+        cache: dict = {}
+        for name in order:
+            assert resolve_refs(_ref(name), ACYCLIC, cache) == _baseline_resolve_refs(_ref(name), ACYCLIC)
+
+
+def test_resolution_does_not_mutate_spec():
+    spec = copy.deepcopy(CYCLIC)
+    for name in spec["components"]["schemas"]:
+        resolve_refs(_ref(name), spec)
+    assert spec == CYCLIC
+
+
+def test_cycle_is_followed_once_then_cut():
+    assert resolve_refs(_ref("A"), CYCLIC) == {
+        "type": "object",
+        "properties": {
+            "b": {"type": "object", "properties": {"a": {}}},
+            "tag": {"type": "object", "properties": {"label": {"type": "string"}}},
+        },
+    }
+    assert resolve_refs(_ref("Self"), CYCLIC) == {"type": "object", "properties": {"me": {}}}
+    assert resolve_refs(_ref("Loop"), CYCLIC) == {}
+
+
+def test_cycles_resolve_the_same_in_any_order():
+    names = list(CYCLIC["components"]["schemas"])
+    expected = {name: resolve_refs(_ref(name), CYCLIC) for name in names}
+    for order in itertools.permutations(names):
+        cache: dict = {}
+        for name in order:
+            assert resolve_refs(_ref(name), CYCLIC, cache) == expected[name], order
+
+
+def test_only_cycle_free_refs_are_cached():
+    cache: dict = {}
+    resolve_refs(_ref("A"), CYCLIC, cache)
+    assert set(cache) == {"#/components/schemas/Tag"}
+
+
+def test_spec_walk_keeps_full_body_after_param_hits_cycle():
+    spec = copy.deepcopy(CYCLIC)
+    spec["paths"] = {
+        "/a": {
+            "post": {
+                "parameters": [{"name": "q", "in": "query", "schema": _ref("B")}],
+                "requestBody": {"content": {"application/json": {"schema": _ref("A")}}},
+            }
+        }
+    }
+    (endpoint,) = _spec_to_endpoints(spec)
+    assert endpoint.request_body_schema == resolve_refs(_ref("A"), CYCLIC)
+
+
+def test_deep_nesting_matches_baseline():
+    schema = _deep_schema(200)
+    assert resolve_refs(schema, ACYCLIC) == _baseline_resolve_refs(schema, ACYCLIC)
+
+
+def test_deep_nesting_scans_each_subtree_once():
+    calls: dict[int, int] = {}
+
+    class CountingDict(dict):
+        def values(self):
+            calls[id(self)] = calls.get(id(self), 0) + 1
+            return super().values()
+
+    schema = _deep_schema(200, CountingDict)
+    resolve_refs(schema, ACYCLIC)
+    assert calls
+    assert max(calls.values()) == 1
@@ -0,0 +1,73 @@
+"""Tests for the per-URL spec cache in surface_discovery.openapi_parser."""
+
+from __future__ import annotations
+
+import orjson
+import pytest
+
+from surface_discovery import openapi_parser
+
+SPEC = {"openapi": "3.0.0", "paths": {"/ping": {"get": {"summary": "Ping"}}}}
+
+
+class FakeResponse:
+    def __init__(self, status_code: int, etag: str | None = None):
+        self.status_code = status_code
+        self.headers = {"ETag": etag} if etag else {}
+        self.content = orjson.dumps(SPEC) if status_code == 200 else b""
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+class FakeSession:
+    """Answers every GET with the spec, or 304 when If-None-Match matches."""
+
+    def __init__(self):
+        self.requests: list[tuple[str, str | None]] = []
+
+    def get(self, url, timeout=None, headers=None):
+        etag = (headers or {}).get("If-None-Match")
+        self.requests.append((url, etag))
+        if etag == '"v1"':
+            return FakeResponse(304, '"v1"')
+        return FakeResponse(200, '"v1"')
+
+
+@pytest.fixture
+def session(monkeypatch):
+    fake = FakeSession()
+    monkeypatch.setattr(openapi_parser, "_SESSION", fake)
+    monkeypatch.setattr(openapi_parser, "_SPEC_CACHE", {})
+    monkeypatch.setattr(openapi_parser, "_SPEC_CACHE_MAXSIZE", 3)
+    return fake
+
+
+def _url(i: int) -> str:
+    return f"http://spec{i}.test/openapi.json"
+
+
+def test_fresh_entry_is_served_without_a_request(session):
+    first = openapi_parser.fetch_and_parse(_url(0))
+    second = openapi_parser.fetch_and_parse(_url(0))
+    assert first == second
+    assert first is not second
+    assert len(session.requests) == 1
+
+
+def test_cache_hit_protects_entry_from_eviction(session):
+    for i in range(3):
+        openapi_parser.fetch_and_parse(_url(i))
+    openapi_parser.fetch_and_parse(_url(0))
+    openapi_parser.fetch_and_parse(_url(3))
+    assert list(openapi_parser._SPEC_CACHE) == [_url(2), _url(0), _url(3)]
+
+
+def test_revalidated_entry_moves_to_most_recent(session, monkeypatch):
+    for i in range(3):
+        openapi_parser.fetch_and_parse(_url(i))
+    monkeypatch.setattr(openapi_parser, "_SPEC_CACHE_TTL", 0.0)
+    openapi_parser.fetch_and_parse(_url(0))
+    assert session.requests[-1] == (_url(0), '"v1"')
+    openapi_parser.fetch_and_parse(_url(3))
+    assert list(openapi_parser._SPEC_CACHE) == [_url(2), _url(0), _url(3)]